@@ -2,8 +2,13 @@
 AI Assistant Module
 Provides enhanced chat interface with planning, memory, agent processing, and guardrails validation.
 """
+import os
+from collections import deque
 import streamlit as st
 
+# Chat messages kept (and re-rendered on every rerun); older ones are dropped
+CHAT_HISTORY_MAX = int(os.getenv("CHAT_HISTORY_MAX", "50"))
+
 
 def show(data, agent, guardrails):
     """Display enhanced AI Assistant chat interface"""
@@ -11,8 +16,8 @@ def show(data, agent, guardrails):
     st.write("Now with planning and memory! Ask me anything about your profile.")
     
     # Simple chat interface (enhanced from v1)
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
+    if not isinstance(st.session_state.get("messages"), deque):
+        st.session_state.messages = deque(st.session_state.get("messages", []), maxlen=CHAT_HISTORY_MAX)
     
     # Display chat history
     for message in st.session_state.messages:
@@ -60,7 +65,7 @@ def show(data, agent, guardrails):
                                 "plan": result.get("plan", []),
                                 "execution_time": result.get("execution_time", "N/A"),
                                 "context_used": result.get("context_used", 0),
-                                "violations": len(violations + response_violations)
+                                "violations": len(violations) + len(response_violations)
                             }
                         else:
                             response = result.get("response", "Sorry, I encountered an error.")
@@ -5,6 +5,46 @@ project ideas, skill analysis, and profile analysis.
 """
 import streamlit as st
 
+_PROFILE_ANALYSIS_PROMPT = """Analyze this professional profile and provide insights on:
+    1. Key strengths and expertise areas
+    2. Profile completeness and suggestions for improvement
+    3. Professional positioning and value proposition
+    4. Areas that could use more detail or examples
+    
+    Please be specific and actionable in your recommendations."""
+
+_CAREER_PROMPT = """Based on this professional profile, suggest:
+    1. Potential career advancement opportunities
+    2. Related roles that would be a good fit
+    3. Industries or companies that would value this skillset
+    4. Next steps for career growth
+    
+    Focus on realistic and achievable suggestions."""
+
+_PROJECT_IDEAS_PROMPT = """Suggest project ideas based on this professional profile:
+    1. Projects that would showcase current skills
+    2. Projects to learn new technologies
+    3. Open source contribution opportunities
+    4. Portfolio projects for career advancement
+    
+    Make suggestions specific and actionable with clear next steps."""
+
+_SKILL_ANALYSIS_PROMPT = """Analyze the technical skills in this profile:
+    1. Skill strengths and areas of expertise
+    2. Potential skill gaps for current role/goals
+    3. Emerging technologies to consider learning
+    4. Skill combinations that create unique value
+    
+    Provide specific learning recommendations and resources when possible."""
+
+# (heading, prompt) for each insight, used by "Generate All Insights"
+_INSIGHT_PROMPTS = [
+    ("🎯 Profile Analysis", _PROFILE_ANALYSIS_PROMPT),
+    ("📈 Career Suggestions", _CAREER_PROMPT),
+    ("🚀 Project Ideas", _PROJECT_IDEAS_PROMPT),
+    ("📊 Skill Analysis", _SKILL_ANALYSIS_PROMPT)
+]
+
 
 def show(data, agent):
     """Display AI insights interface with various analysis options"""
@@ -18,13 +58,7 @@ def show(data, agent):
         if st.button("🎯 Analyze Profile", type="primary"):
             with st.spinner("Analyzing your profile..."):
                 try:
-                    prompt = """Analyze this professional profile and provide insights on:
-                    1. Key strengths and expertise areas
-                    2. Profile completeness and suggestions for improvement
-                    3. Professional positioning and value proposition
-                    4. Areas that could use more detail or examples
-                    
-                    Please be specific and actionable in your recommendations."""
+                    prompt = _PROFILE_ANALYSIS_PROMPT
                     
                     result = agent.ask_question(prompt)
                     if result["success"]:
@@ -38,13 +72,7 @@ def show(data, agent):
         if st.button("📈 Career Suggestions"):
             with st.spinner("Generating career suggestions..."):
                 try:
-                    prompt = """Based on this professional profile, suggest:
-                    1. Potential career advancement opportunities
-                    2. Related roles that would be a good fit
-                    3. Industries or companies that would value this skillset
-                    4. Next steps for career growth
-                    
-                    Focus on realistic and achievable suggestions."""
+                    prompt = _CAREER_PROMPT
                     
                     result = agent.ask_question(prompt)
                     if result["success"]:
@@ -59,13 +87,7 @@ def show(data, agent):
         if st.button("🚀 Project Ideas"):
             with st.spinner("Brainstorming project ideas..."):
                 try:
-                    prompt = """Suggest project ideas based on this professional profile:
-                    1. Projects that would showcase current skills
-                    2. Projects to learn new technologies
-                    3. Open source contribution opportunities
-                    4. Portfolio projects for career advancement
-                    
-                    Make suggestions specific and actionable with clear next steps."""
+                    prompt = _PROJECT_IDEAS_PROMPT
                     
                     result = agent.ask_question(prompt)
                     if result["success"]:
@@ -79,13 +101,7 @@ def show(data, agent):
         if st.button("📊 Skill Analysis"):
             with st.spinner("Analyzing skills and gaps..."):
                 try:
-                    prompt = """Analyze the technical skills in this profile:
-                    1. Skill strengths and areas of expertise
-                    2. Potential skill gaps for current role/goals
-                    3. Emerging technologies to consider learning
-                    4. Skill combinations that create unique value
-                    
-                    Provide specific learning recommendations and resources when possible."""
+                    prompt = _SKILL_ANALYSIS_PROMPT
                     
                     result = agent.ask_question(prompt)
                     if result["success"]:
@@ -96,6 +112,20 @@ def show(data, agent):
                 except Exception as e:
                     st.error(f"Error during skill analysis: {str(e)}")
     
+    # All four insights from one retrieval pass and one LLM call
+    if st.button("✨ Generate All Insights"):
+        with st.spinner("Generating all insights..."):
+            try:
+                results = agent.ask_multi([prompt for _, prompt in _INSIGHT_PROMPTS])
+                for (heading, _), result in zip(_INSIGHT_PROMPTS, results):
+                    st.markdown(f"#### {heading}")
+                    if result["success"]:
+                        st.write(result["response"])
+                    else:
+                        st.error(f"{heading} failed: {result.get('error', 'Unknown error')}")
+            except Exception as e:
+                st.error(f"Error generating insights: {str(e)}")
+    
     # Cache info
     st.divider()
     st.info("💡 **Tip:** AI insights are generated in real-time based on your current profile data. Update your profile and regenerate insights to see new recommendations.")
\ No newline at end of file
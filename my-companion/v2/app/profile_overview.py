@@ -5,8 +5,11 @@ Displays consolidated view of all profile data including user profile, technical
 import streamlit as st
 
 
-def show(data):
-    """Display complete profile overview - all sections"""
+def show(data, skills_formatted=None):
+    """
+    Display complete profile overview - all sections
+    skills_formatted: optional precomputed {category: "skill1, skill2"} for dict-format skills
+    """
     st.header("📊 Profile Overview")
     st.write("Complete profile view - all sections")
     
@@ -25,7 +28,10 @@ def show(data):
     if data.get("technical_skills"):
         st.subheader("💻 Technical Skills")
         skills = data["technical_skills"]
-        if isinstance(skills, dict):
+        if isinstance(skills, dict) and skills_formatted is not None:
+            for category, skills_comma_separated in skills_formatted.items():
+                st.write(f"**{category}:** {skills_comma_separated}")
+        elif isinstance(skills, dict):
             for category, skill_list in skills.items():
                 if isinstance(skill_list, list):
                     skills_comma_separated = ", ".join(skill_list)
@@ -4,6 +4,20 @@ Provides semantic search functionality across all profile data using vector data
 """
 import streamlit as st
 
+# Display labels for known vector DB sources, built once instead of per result
+_SOURCE_LABELS = {
+    source: source.replace('_', ' ').title()
+    for source in ('basic_info', 'user_profile', 'technical_skills', 'projects', 'other_activities')
+}
+
+# Result title per source: (prefix, metadata field, fallback when the field is missing)
+_TITLE_FIELDS = {
+    'user_profile': ('Profile', 'key', 'Info'),
+    'technical_skills': ('Skill', 'category', 'General'),
+    'projects': ('Project', 'name', 'Unknown'),
+    'other_activities': ('Activity', 'name', 'Unknown')
+}
+
 
 def show(data, vector_db):
     """Display search interface for profile data"""
@@ -28,27 +42,25 @@ def show(data, vector_db):
                         for i, result in enumerate(search_results, 1):
                             metadata = result.get('metadata', {})
                             source = metadata.get('source', 'Unknown')
-                            result_type = metadata.get('type', 'content')
+                            category = metadata.get('category')
+                            name = metadata.get('name')
                             
                             # Create a more descriptive title
-                            if source == 'user_profile':
-                                title = f"Profile - {metadata.get('key', 'Info')}"
-                            elif source == 'technical_skills':
-                                title = f"Skill - {metadata.get('category', 'General')}"
-                            elif source == 'projects':
-                                title = f"Project - {metadata.get('name', 'Unknown')}"
-                            elif source == 'other_activities':
-                                title = f"Activity - {metadata.get('name', 'Unknown')}"
+                            title_fields = _TITLE_FIELDS.get(source)
+                            if title_fields:
+                                prefix, field, fallback = title_fields
+                                title = f"{prefix} - {metadata.get(field, fallback)}"
                             else:
-                                title = f"{source.title()} - {result_type}"
+                                title = f"{source.title()} - {metadata.get('type', 'content')}"
                             
                             with st.expander(f"#{i} - {title} (Score: {result['score']:.3f})"):
                                 st.write(f"**Content:** {result['text']}")
-                                st.write(f"**Source:** {source.replace('_', ' ').title()}")
-                                if metadata.get('category'):
-                                    st.write(f"**Category:** {metadata['category']}")
-                                if metadata.get('name') and source != 'projects':
-                                    st.write(f"**Name:** {metadata['name']}")
+                                source_label = _SOURCE_LABELS.get(source) or source.replace('_', ' ').title()
+                                st.write(f"**Source:** {source_label}")
+                                if category:
+                                    st.write(f"**Category:** {category}")
+                                if name and source != 'projects':
+                                    st.write(f"**Name:** {name}")
                     else:
                         st.info("No results found. Try different keywords or check if your profile data is indexed.")
                         
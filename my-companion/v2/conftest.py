@@ -0,0 +1,3 @@
+"""
+Pytest root for My Companion v2 - puts core/ and utils/ on the import path
+"""
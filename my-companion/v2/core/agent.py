@@ -2,14 +2,47 @@
 Simple Lightweight Agent - Minimal Agentic AI for v2
 Just adds basic planning and memory to existing v1 functionality
 """
+import heapq
 import json
+import re
 import time
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from types import MappingProxyType
 
+# Fixed LLM call parameters (max_tokens is chosen per call)
+LLM_MODEL = "lmstudio-community/Meta-Llama-3.1-8B-Instruct-GGUF"
+_LLM_PARAMS = MappingProxyType({"model": LLM_MODEL, "temperature": 0.7})
 
-@dataclass
+# Planning keywords, each group fused into a single alternation (substring match)
+_SEARCH_KEYWORDS = ('project', 'skill', 'experience', 'work', 'activity', 'what', 'when', 'how', 'list', 'show')
+_ANALYSIS_KEYWORDS = ('analyze', 'compare', 'recommend', 'suggest', 'best', 'improve', 'insight')
+_SEARCH_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _SEARCH_KEYWORDS)))
+_ANALYSIS_KEYWORDS_RE = re.compile('|'.join(map(re.escape, _ANALYSIS_KEYWORDS)))
+
+# Fixed instructions lead every prompt so consecutive requests share a token
+# prefix the LLM server can reuse from its KV cache; per-request text follows
+_PROMPT_PREFIX = """You are a helpful personal assistant. Answer the user's question based on their profile data.
+Provide a helpful, personalized response based on the information available."""
+
+# "### Section 2", "### Section 2: Title" or "**Section 2**" heading lines that split an ask_multi answer
+# (a # or ** marker is required, so body text starting with "Section 2 ..." is not a heading)
+_SECTION_HEADING_RE = re.compile(r'^\s*(?:#{1,6}\s*|\*\*)Section\s+(\d+)\b[^\n]*$', re.MULTILINE | re.IGNORECASE)
+
+
+def _split_sections(response: str) -> Dict[int, str]:
+    """Split an ask_multi answer into section bodies keyed by section number"""
+    # Each body starts on the line after its heading (first occurrence of each number wins)
+    sections = {}
+    headings = list(_SECTION_HEADING_RE.finditer(response))
+    for heading, next_heading in zip(headings, headings[1:] + [None]):
+        end = next_heading.start() if next_heading else len(response)
+        sections.setdefault(int(heading.group(1)), response[heading.end():end].strip())
+    return sections
+
+
+@dataclass(slots=True)
 class Message:
     """Simple message for conversation history"""
     role: str
@@ -23,12 +56,18 @@ class Agent:
     No complex frameworks, just simple planning logic
     """
     
-    def __init__(self, llm_client, data_loader, vector_db=None):
+    def __init__(self, llm_client, data_loader, vector_db=None, data_version=None):
         self.llm_client = llm_client
         self.data_loader = data_loader
         self.vector_db = vector_db
+        # Optional callable returning a value that changes whenever the data does
+        self.data_version = data_version
         self.conversation_history: List[Message] = []
         self.max_history = 20
+        
+        # Pre-lowered keyword search view of the data, keyed by data version
+        self._keyword_index: List[tuple] = []
+        self._keyword_index_key = None
     
     def _add_to_history(self, role: str, content: str):
         """Add message to conversation history"""
@@ -43,6 +82,25 @@ class Agent:
         if len(self.conversation_history) > self.max_history:
             self.conversation_history = self.conversation_history[-self.max_history:]
     
+    def _get_keyword_index(self, data: Dict) -> List[tuple]:
+        """
+        Get (section, item, item_text_lower) for every list item in data
+        Serialized and lowercased once per data version instead of per question
+        (rebuilt on every call when no data_version callable was given)
+        """
+        data_version = self.data_version() if self.data_version else None
+        
+        key = (id(data), data_version)
+        if data_version is None or key != self._keyword_index_key:
+            self._keyword_index = [
+                (section, item, json.dumps(item).lower())
+                for section, items in data.items() if isinstance(items, list)
+                for item in items
+            ]
+            self._keyword_index_key = key
+        
+        return self._keyword_index
+    
     def _create_simple_plan(self, question: str) -> List[str]:
         """
         Create a simple plan for answering the question
@@ -57,13 +115,11 @@ class Agent:
         plan_steps.append("understand_question")
         
         # Check if we need to search data
-        search_keywords = ['project', 'skill', 'experience', 'work', 'activity', 'what', 'when', 'how', 'list', 'show']
-        if any(keyword in question_lower for keyword in search_keywords):
+        if _SEARCH_KEYWORDS_RE.search(question_lower):
             plan_steps.append("search_knowledge")
         
         # Check if we need analysis
-        analysis_keywords = ['analyze', 'compare', 'recommend', 'suggest', 'best', 'improve', 'insight']
-        if any(keyword in question_lower for keyword in analysis_keywords):
+        if _ANALYSIS_KEYWORDS_RE.search(question_lower):
             plan_steps.append("analyze_data")
         
         # Always end with generating response
@@ -80,44 +136,7 @@ class Agent:
             return {"understanding": f"Processing question: {question}"}
         
         elif step == "search_knowledge":
-            # Enhanced RAG-based search
-            try:
-                relevant_data = []
-                
-                # Primary: Vector search (semantic similarity)
-                if self.vector_db:
-                    vector_results = self.vector_db.search(question, top_k=5)
-                    for result in vector_results:
-                        relevant_data.append({
-                            "type": "vector_search",
-                            "text": result["text"],
-                            "metadata": result["metadata"],
-                            "score": result["score"]
-                        })
-                
-                # Secondary: Keyword search as fallback
-                data = self.data_loader()
-                question_words = question.lower().split()
-                
-                # Search in different data sections
-                for section, items in data.items():
-                    if isinstance(items, list):
-                        for item in items:
-                            item_text = json.dumps(item).lower()
-                            if any(word in item_text for word in question_words):
-                                relevant_data.append({
-                                    "type": "keyword_search",
-                                    "section": section, 
-                                    "item": item,
-                                    "score": 0.5  # Lower score for keyword matches
-                                })
-                
-                # Sort by score (vector results first)
-                relevant_data.sort(key=lambda x: x.get("score", 0), reverse=True)
-                
-                return {"search_results": relevant_data[:8]}  # Limit results
-            except Exception as e:
-                return {"search_results": [], "error": str(e)}
+            return self._search_knowledge(question)
         
         elif step == "analyze_data":
             search_results = context.get("search_results", [])
@@ -131,6 +150,71 @@ class Agent:
         
         return {"step_result": f"Completed {step}"}
     
+    def _search_knowledge(self, question: str, vector_results: Optional[List[Dict]] = None) -> Dict:
+        """
+        Enhanced RAG-based search for one question
+        vector_results: this question's vector search, if already run (e.g. batched)
+        """
+        try:
+            relevant_data = []
+            
+            # Primary: Vector search (semantic similarity)
+            if vector_results is None and self.vector_db:
+                vector_results = self.vector_db.search(question, top_k=5)
+            for result in vector_results or []:
+                relevant_data.append({
+                    "type": "vector_search",
+                    "text": result["text"],
+                    "metadata": result["metadata"],
+                    "score": result["score"]
+                })
+            
+            # Secondary: Keyword search as fallback
+            data = self.data_loader()
+            # Repeated words add nothing to the match, scan each once
+            question_words = list(dict.fromkeys(question.lower().split()))
+            
+            # Search in different data sections
+            if question_words:
+                # One multi-word scan per item instead of a substring test per word
+                question_re = re.compile('|'.join(map(re.escape, question_words)))
+                for section, item, item_text in self._get_keyword_index(data):
+                    if question_re.search(item_text):
+                        relevant_data.append({
+                            "type": "keyword_search",
+                            "section": section, 
+                            "item": item,
+                            "score": 0.5  # Lower score for keyword matches
+                        })
+            
+            # Keep the top scored results (vector results first)
+            top_results = heapq.nlargest(8, relevant_data, key=lambda x: x.get("score", 0))
+            
+            return {"search_results": top_results}
+        except Exception as e:
+            return {"search_results": [], "error": str(e)}
+    
+    def _search_knowledge_multi(self, questions: List[str]) -> Dict:
+        """
+        Search for each question separately, with the vector searches batched into one call
+        Keeps each question's top 5 results, without repeating items shared between questions
+        """
+        try:
+            if self.vector_db:
+                vector_batches = self.vector_db.search_batch(questions, top_k=5)
+            else:
+                vector_batches = [[] for _ in questions]
+        except Exception as e:
+            return {"search_results": [], "error": str(e)}
+        
+        merged = {}
+        for question, vector_results in zip(questions, vector_batches):
+            for result in self._search_knowledge(question, vector_results)["search_results"][:5]:
+                key = result.get("text") or json.dumps(result.get("item"), sort_keys=True)
+                merged.setdefault(key, result)
+        
+        return {"search_results": list(merged.values())}
+    
     def ask_question(self, question: str) -> Dict[str, Any]:
         """
         Main method to ask a question with simple agentic behavior
@@ -151,7 +235,10 @@ class Agent:
                 execution_context.update(step_result)
             
             # Step 3: Generate final response using LLM
-            response = self._generate_llm_response(question, execution_context)
+            try:
+                response = self._generate_llm_response(question, execution_context)
+            except Exception as e:
+                response = f"I'm having trouble connecting to the AI service: {str(e)}"
             
             # Add response to history
             self._add_to_history("assistant", response)
@@ -176,54 +263,115 @@ class Agent:
                 "error": str(e)
             }
     
-    def _generate_llm_response(self, question: str, context: Dict) -> str:
-        """Generate response using LLM with context"""
+    def ask_multi(self, questions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Answer several questions with one batched retrieval pass and one LLM call
+        Returns one ask_question-style result per question; if the LLM call fails
+        every question gets that error, while a section missing from an otherwise
+        successful answer falls back to its own ask_question call
+        """
+        if len(questions) < 2:
+            return [self.ask_question(question) for question in questions]
+        
+        start_time = time.time()
+        
+        # Planning runs once over all questions together
+        combined_question = "\n\n".join(questions)
+        llm_question = "\n\n".join(
+            f"### Section {i}\n{question}" for i, question in enumerate(questions, 1)
+        ) + f"\n\nAnswer all {len(questions)} sections in order. Start each answer with its '### Section <number>' heading line."
+        
+        self._add_to_history("user", llm_question)
         
-        # Build enhanced context for LLM using RAG results
-        context_text = ""
+        try:
+            plan = self._create_simple_plan(combined_question)
+            
+            # Retrieval still runs per question, so each section gets its own context
+            execution_context = {}
+            for step in plan:
+                if step == "search_knowledge":
+                    step_result = self._search_knowledge_multi(questions)
+                else:
+                    step_result = self._execute_step(step, combined_question, execution_context)
+                execution_context.update(step_result)
+            
+            # An LLM failure raises here, so it is reported once instead of retried per question
+            response = self._generate_llm_response(
+                llm_question, execution_context,
+                max_tokens=500 * len(questions), max_results=5 * len(questions)
+            )
+            self._add_to_history("assistant", response)
+            
+            answers = _split_sections(response)
+            
+            execution_time = time.time() - start_time
+            context_used = len(execution_context.get("search_results", []))
+        
+        except Exception as e:
+            error_response = f"Sorry, I encountered an error: {str(e)}"
+            self._add_to_history("assistant", error_response)
+            
+            return [{"success": False, "response": error_response, "error": str(e)} for _ in questions]
+        
+        results = []
+        for i, question in enumerate(questions, 1):
+            if answers.get(i):
+                results.append({
+                    "success": True,
+                    "response": answers[i],
+                    "plan": plan,
+                    "execution_time": f"{execution_time:.2f}s",
+                    "context_used": context_used
+                })
+            else:
+                results.append(self.ask_question(question))
+        
+        return results
+    
+    def _generate_llm_response(self, question: str, context: Dict, max_tokens: int = 500, max_results: int = 5) -> str:
+        """Generate response using LLM with context (raises if the LLM call fails)"""
+        
+        # Build enhanced context for LLM using RAG results (pieces joined once)
+        context_parts = []
         search_results = context.get("search_results", [])
         
         if search_results:
-            context_text = "Relevant information from your profile:\n"
-            for i, result in enumerate(search_results[:5], 1):
-                if result.get("type") == "vector_search":
+            context_parts.append("Relevant information from your profile:\n")
+            for i, result in enumerate(search_results[:max_results], 1):
+                result_type = result.get("type")
+                if result_type == "vector_search":
                     score = result.get("score", 0)
-                    context_text += f"{i}. [Vector Match {score:.2f}] {result['text']}\n"
-                elif result.get("type") == "keyword_search" and "item" in result:
-                    context_text += f"{i}. [Keyword Match] {json.dumps(result['item'], indent=2)}\n"
+                    context_parts.append(f"{i}. [Vector Match {score:.2f}] {result['text']}\n")
+                elif result_type == "keyword_search" and "item" in result:
+                    context_parts.append(f"{i}. [Keyword Match] {json.dumps(result['item'], indent=2)}\n")
                 else:
-                    context_text += f"{i}. {str(result)}\n"
+                    context_parts.append(f"{i}. {str(result)}\n")
+        context_text = "".join(context_parts)
         
         # Build conversation history context
-        history_text = ""
+        history_parts = []
         if len(self.conversation_history) > 1:  # More than just current question
-            history_text = "\nRecent conversation:\n"
+            history_parts.append("\nRecent conversation:\n")
             for msg in self.conversation_history[-6:-1]:  # Last 5 messages, excluding current
-                history_text += f"{msg.role}: {msg.content}\n"
+                history_parts.append(f"{msg.role}: {msg.content}\n")
+        history_text = "".join(history_parts)
         
         # Create prompt for LLM
-        prompt = f"""You are a helpful personal assistant. Answer the user's question based on their profile data.
+        prompt = f"""{_PROMPT_PREFIX}
 
 {context_text}
 {history_text}
 
-User Question: {question}
-
-Provide a helpful, personalized response based on the information available."""
+User Question: {question}"""
         
-        try:
-            # Call LLM (same as v1 approach)
-            response = self.llm_client.chat.completions.create(
-                model="lmstudio-community/Meta-Llama-3.1-8B-Instruct-GGUF",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            return response.choices[0].message.content.strip()
+        # Call LLM (same as v1 approach)
+        response = self.llm_client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+            **_LLM_PARAMS
+        )
         
-        except Exception as e:
-            return f"I'm having trouble connecting to the AI service: {str(e)}"
+        return response.choices[0].message.content.strip()
     
     def get_conversation_history(self) -> List[Dict]:
         """Get recent conversation history"""
@@ -247,6 +395,7 @@ Provide a helpful, personalized response based on the information available."""
                 return {"success": False, "error": "No vector database available"}
             
             data = self.data_loader()
+            self._keyword_index_key = None
             documents_added = self.vector_db.rebuild_from_data(data)
             
             return {
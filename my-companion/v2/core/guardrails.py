@@ -5,12 +5,13 @@ Just essential input validation and output filtering
 import re
 import time
 import os
+from collections import OrderedDict, deque
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SafetyViolation:
     """Simple violation record"""
     type: str
@@ -18,6 +19,78 @@ class SafetyViolation:
     severity: str  # "low", "medium", "high"
 
 
+# Built-in patterns are compiled once at import and shared by every instance
+
+# Basic PII patterns (simplified)
+_PII_PATTERNS = {
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
+    'phone': re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
+    'ssn': re.compile(r'\b\d{3}-?\d{2}-?\d{4}\b'),
+    'credit_card': re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b')
+}
+
+# Mask text and violation messages per PII type, built once
+_PII_MASKS = {pii_type: f"[MASKED_{pii_type.upper()}]" for pii_type in _PII_PATTERNS}
+_PII_MESSAGES = {pii_type: f"Potential {pii_type} detected and masked" for pii_type in _PII_PATTERNS}
+_RESPONSE_PII_MESSAGES = {pii_type: f"PII ({pii_type}) detected in response and masked" for pii_type in _PII_PATTERNS}
+
+# All PII patterns fused into one alternation, so clean text is scanned once
+_PII_ANY_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in _PII_PATTERNS.values()))
+
+# Basic unsafe content patterns
+_UNSAFE_PATTERNS = (
+    re.compile(r'\b(password|secret|private key|api key)\s*[:=]\s*\S+', re.IGNORECASE),
+    re.compile(r'<script|javascript:|data:text/html', re.IGNORECASE),
+)
+
+# All unsafe patterns fused into one alternation ("is anything unsafe?" in one scan)
+_UNSAFE_ANY_RE = re.compile('|'.join(f'(?:{p.pattern})' for p in _UNSAFE_PATTERNS), re.IGNORECASE)
+
+# Blocked topics (simple keyword matching)
+_BLOCKED_TOPICS = (
+    'illegal', 'violence', 'harmful', 'hack', 'exploit', 'malware'
+)
+
+# Blocked topics in one scan; the lookahead reports topics at every position
+_BLOCKED_TOPICS_RE = re.compile('(?=(' + '|'.join(map(re.escape, _BLOCKED_TOPICS)) + '))', re.IGNORECASE)
+
+# Common business entity indicators
+_CLIENT_PATTERNS = {
+    'company_indicators': re.compile(r'\b(Inc\.?|LLC|Corp\.?|Corporation|Ltd\.?|Limited|Company|Co\.)\b', re.IGNORECASE),
+    # Possessive \s++ never gives back whitespace (the next char must be [A-Z] anyway)
+    'business_terms': re.compile(r'\b(client|customer|employer|organization|firm|enterprise|business|vendor|contractor)\s++[A-Z][a-zA-Z\s&]{2,20}\b'),
+    'project_codes': re.compile(r'\b[A-Z]{2,4}-\d{3,6}\b'),  # Project codes like ABC-1234
+    'confidential_terms': re.compile(r'\b(confidential|proprietary|internal|private|restricted|classified)\b', re.IGNORECASE)
+}
+
+# Generic replacement for each client pattern (custom patterns use '[CLIENT-INFO]')
+_CLIENT_REPLACEMENTS = {
+    'company_indicators': '[COMPANY]',
+    'business_terms': 'a business partner',
+    'project_codes': '[PROJECT-CODE]',
+    'confidential_terms': '[CONFIDENTIAL]'
+}
+
+# Violation message per client pattern, including env-provided custom patterns
+_CLIENT_MESSAGES = {
+    name: f"Potential client/business information detected ({name})"
+    for name in (*_CLIENT_PATTERNS, 'custom')
+}
+
+# Built-in client patterns as one alternation (flags scoped per group); only a
+# "does anything match?" gate, the per-pattern replacements must stay sequential
+_CLIENT_COMBINED_RE = re.compile('|'.join(
+    f"(?P<{name}>(?i:{pattern.pattern}))" if pattern.flags & re.IGNORECASE else f"(?P<{name}>{pattern.pattern})"
+    for name, pattern in _CLIENT_PATTERNS.items()
+))
+
+
+@lru_cache(maxsize=256)
+def _compile_client_pattern(pattern: str) -> re.Pattern:
+    """Compile a custom client pattern once per distinct pattern string"""
+    return re.compile(pattern, re.IGNORECASE)
+
+
 class Guardrails:
     """
     Lightweight guardrails system with basic safety checks
@@ -25,42 +98,33 @@ class Guardrails:
     """
     
     def __init__(self):
-        # Rate limiting storage
-        self.rate_limit_storage = {}
+        # Rate limiting storage: user_id -> deque of monotonic request times (LRU ordered)
+        self.rate_limit_storage: OrderedDict = OrderedDict()
+        self.max_tracked_users = 100_000
+        self._rate_limit_checks = 0
         self.max_requests_per_minute = int(os.getenv("MAX_REQUESTS_PER_MINUTE", "10"))
         
+        # Recent detect_client_info results (form fields are re-validated on every rerun)
+        self._detection_cache: OrderedDict = OrderedDict()
+        self.max_detection_cache_size = 1024
+        
         # Client privacy protection patterns
         self.client_detection_enabled = os.getenv("CLIENT_PRIVACY_PROTECTION", "true").lower() == "true"
         self._load_client_patterns()
         
         # Basic PII patterns (simplified)
-        self.pii_patterns = {
-            'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'),
-            'phone': re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'),
-            'ssn': re.compile(r'\b\d{3}-?\d{2}-?\d{4}\b'),
-            'credit_card': re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b')
-        }
+        self.pii_patterns = _PII_PATTERNS
         
         # Basic unsafe content patterns
-        self.unsafe_patterns = [
-            re.compile(r'\b(password|secret|private key|api key)\s*[:=]\s*\S+', re.IGNORECASE),
-            re.compile(r'<script|javascript:|data:text/html', re.IGNORECASE),
-        ]
+        self.unsafe_patterns = _UNSAFE_PATTERNS
         
         # Blocked topics (simple keyword matching)
-        self.blocked_topics = [
-            'illegal', 'violence', 'harmful', 'hack', 'exploit', 'malware'
-        ]
+        self.blocked_topics = _BLOCKED_TOPICS
     
     def _load_client_patterns(self):
         """Load client/company detection patterns"""
-        # Common business entity indicators
-        self.client_patterns = {
-            'company_indicators': re.compile(r'\b(Inc\.?|LLC|Corp\.?|Corporation|Ltd\.?|Limited|Company|Co\.)\b', re.IGNORECASE),
-            'business_terms': re.compile(r'\b(client|customer|employer|organization|firm|enterprise|business|vendor|contractor)\s+[A-Z][a-zA-Z\s&]{2,20}\b'),
-            'project_codes': re.compile(r'\b[A-Z]{2,4}-\d{3,6}\b'),  # Project codes like ABC-1234
-            'confidential_terms': re.compile(r'\b(confidential|proprietary|internal|private|restricted|classified)\b', re.IGNORECASE)
-        }
+        # Common business entity indicators (copied, custom patterns are per instance)
+        self.client_patterns = dict(_CLIENT_PATTERNS)
         
         # Load custom client patterns from environment or file
         custom_patterns = os.getenv("CUSTOM_CLIENT_PATTERNS", "")
@@ -69,7 +133,7 @@ class Guardrails:
                 # Expected format: "pattern1|pattern2|pattern3"
                 patterns = [p.strip() for p in custom_patterns.split("|") if p.strip()]
                 if patterns:
-                    self.client_patterns['custom'] = re.compile('|'.join(patterns), re.IGNORECASE)
+                    self.client_patterns['custom'] = _compile_client_pattern('|'.join(patterns))
             except Exception as e:
                 print(f"Warning: Could not load custom client patterns: {e}")
     
@@ -91,41 +155,42 @@ class Guardrails:
             return False, cleaned_input, violations
         
         # Check for blocked topics
-        input_lower = user_input.lower()
+        found_topics = {topic.lower() for topic in _BLOCKED_TOPICS_RE.findall(user_input)}
         for topic in self.blocked_topics:
-            if topic in input_lower:
+            if topic in found_topics:
                 violations.append(SafetyViolation(
                     type="blocked_content",
                     message=f"Content related to '{topic}' is not allowed",
                     severity="high"
                 ))
         
-        # Check for PII and mask it
-        for pii_type, pattern in self.pii_patterns.items():
-            if pattern.search(cleaned_input):
-                violations.append(SafetyViolation(
-                    type="pii_detected",
-                    message=f"Potential {pii_type} detected and masked",
-                    severity="medium"
-                ))
-                cleaned_input = pattern.sub(f"[MASKED_{pii_type.upper()}]", cleaned_input)
+        # Check for PII and mask it (per-pattern pass only when something matched)
+        if _PII_ANY_RE.search(cleaned_input):
+            for pii_type, pattern in self.pii_patterns.items():
+                cleaned_input, masked = pattern.subn(_PII_MASKS[pii_type], cleaned_input)
+                if masked:
+                    violations.append(SafetyViolation(
+                        type="pii_detected",
+                        message=_PII_MESSAGES[pii_type],
+                        severity="medium"
+                    ))
         
         # Check for client/company information if enabled
         if self.client_detection_enabled:
             cleaned_input = self._sanitize_client_info(cleaned_input, violations)
         
-        # Check for unsafe patterns
-        for pattern in self.unsafe_patterns:
-            if pattern.search(cleaned_input):
-                violations.append(SafetyViolation(
-                    type="unsafe_content",
-                    message="Potentially unsafe content detected",
-                    severity="high"
-                ))
+        # Check for unsafe patterns (per-pattern pass only when something matched)
+        if _UNSAFE_ANY_RE.search(cleaned_input):
+            for pattern in self.unsafe_patterns:
+                if pattern.search(cleaned_input):
+                    violations.append(SafetyViolation(
+                        type="unsafe_content",
+                        message="Potentially unsafe content detected",
+                        severity="high"
+                    ))
         
         # Determine if request is allowed (block only high severity violations)
-        high_severity_violations = [v for v in violations if v.severity == "high"]
-        is_allowed = len(high_severity_violations) == 0
+        is_allowed = not any(v.severity == "high" for v in violations)
         
         return is_allowed, cleaned_input, violations
     
@@ -137,76 +202,85 @@ class Guardrails:
         violations = []
         filtered_response = response
         
-        # Check for PII in response and mask it
-        for pii_type, pattern in self.pii_patterns.items():
-            if pattern.search(filtered_response):
-                violations.append(SafetyViolation(
-                    type="response_pii",
-                    message=f"PII ({pii_type}) detected in response and masked",
-                    severity="medium"
-                ))
-                filtered_response = pattern.sub(f"[MASKED_{pii_type.upper()}]", filtered_response)
+        # Check for PII in response and mask it (per-pattern pass only when something matched)
+        if _PII_ANY_RE.search(filtered_response):
+            for pii_type, pattern in self.pii_patterns.items():
+                filtered_response, masked = pattern.subn(_PII_MASKS[pii_type], filtered_response)
+                if masked:
+                    violations.append(SafetyViolation(
+                        type="response_pii",
+                        message=_RESPONSE_PII_MESSAGES[pii_type],
+                        severity="medium"
+                    ))
         
         # Check for unsafe patterns in response
-        for pattern in self.unsafe_patterns:
-            if pattern.search(filtered_response):
-                violations.append(SafetyViolation(
-                    type="unsafe_response",
-                    message="Unsafe content detected in AI response",
-                    severity="high"
-                ))
-                # Replace with safe message if high severity
-                filtered_response = "I cannot provide that information for safety reasons."
-                break
+        if _UNSAFE_ANY_RE.search(filtered_response):
+            violations.append(SafetyViolation(
+                type="unsafe_response",
+                message="Unsafe content detected in AI response",
+                severity="high"
+            ))
+            # Replace with safe message if high severity
+            filtered_response = "I cannot provide that information for safety reasons."
         
         return filtered_response, violations
     
     def _check_rate_limit(self, user_id: str) -> bool:
-        """Simple rate limiting check"""
-        now = datetime.now()
+        """Simple rate limiting check (sliding one-minute window)"""
+        now = time.monotonic()
+        cutoff = now - 60.0
         
-        # Clean old entries
-        if user_id in self.rate_limit_storage:
-            self.rate_limit_storage[user_id] = [
-                timestamp for timestamp in self.rate_limit_storage[user_id]
-                if now - timestamp < timedelta(minutes=1)
-            ]
+        # Periodically forget users with no requests in the last minute
+        self._rate_limit_checks += 1
+        if self._rate_limit_checks % 1024 == 0:
+            idle_users = [uid for uid, window in self.rate_limit_storage.items()
+                          if not window or window[-1] <= cutoff]
+            for uid in idle_users:
+                del self.rate_limit_storage[uid]
+        
+        window = self.rate_limit_storage.get(user_id)
+        if window is None:
+            window = self.rate_limit_storage[user_id] = deque()
+            # Bound memory: forget the least recently seen users first
+            while len(self.rate_limit_storage) > self.max_tracked_users:
+                self.rate_limit_storage.popitem(last=False)
         else:
-            self.rate_limit_storage[user_id] = []
+            self.rate_limit_storage.move_to_end(user_id)
+        
+        # Clean old entries
+        while window and window[0] <= cutoff:
+            window.popleft()
         
         # Check if under limit
-        if len(self.rate_limit_storage[user_id]) >= self.max_requests_per_minute:
+        if len(window) >= self.max_requests_per_minute:
             return False
         
         # Add current request
-        self.rate_limit_storage[user_id].append(now)
+        window.append(now)
         return True
     
     def _sanitize_client_info(self, text: str, violations: List[SafetyViolation]) -> str:
         """Detect and sanitize client/company information"""
         sanitized_text = text
         
-        # Check each client pattern
+        # One combined pass rules out the usual no-match case for the built-in patterns
+        builtin_match = _CLIENT_COMBINED_RE.search(text) is not None
+        
+        # Patterns must run in order: company indicators are bracketed first, which
+        # stops business_terms from running across the suffix into the next words
         for pattern_name, pattern in self.client_patterns.items():
-            matches = pattern.findall(sanitized_text)
-            if matches:
+            if not builtin_match and pattern_name in _CLIENT_PATTERNS:
+                continue
+            
+            # Replace with generic terms
+            replacement = _CLIENT_REPLACEMENTS.get(pattern_name, '[CLIENT-INFO]')
+            sanitized_text, replaced = pattern.subn(replacement, sanitized_text)
+            if replaced:
                 violations.append(SafetyViolation(
                     type="client_info_detected",
-                    message=f"Potential client/business information detected ({pattern_name})",
+                    message=_CLIENT_MESSAGES[pattern_name],
                     severity="medium"
                 ))
-                
-                # Replace with generic terms
-                if pattern_name == 'company_indicators':
-                    sanitized_text = pattern.sub('[COMPANY]', sanitized_text)
-                elif pattern_name == 'business_terms':
-                    sanitized_text = pattern.sub('a business partner', sanitized_text)
-                elif pattern_name == 'project_codes':
-                    sanitized_text = pattern.sub('[PROJECT-CODE]', sanitized_text)
-                elif pattern_name == 'confidential_terms':
-                    sanitized_text = pattern.sub('[CONFIDENTIAL]', sanitized_text)
-                else:
-                    sanitized_text = pattern.sub('[CLIENT-INFO]', sanitized_text)
         
         return sanitized_text
     
@@ -215,8 +289,20 @@ class Guardrails:
         if not self.client_detection_enabled:
             return []
         
+        cached = self._detection_cache.get(text)
+        if cached is not None:
+            self._detection_cache.move_to_end(text)
+            return [dict(detection) for detection in cached]
+        
+        # One combined pass rules out the usual no-match case; the per-pattern
+        # scans (whose matches may overlap) only run when something hits
+        if _CLIENT_COMBINED_RE.search(text):
+            patterns_to_scan = self.client_patterns.items()
+        else:
+            patterns_to_scan = [(name, pattern) for name, pattern in self.client_patterns.items() if name not in _CLIENT_PATTERNS]
+        
         detections = []
-        for pattern_name, pattern in self.client_patterns.items():
+        for pattern_name, pattern in patterns_to_scan:
             matches = pattern.findall(text)
             for match in matches:
                 detections.append({
@@ -224,6 +310,12 @@ class Guardrails:
                     'match': match if isinstance(match, str) else ' '.join(match),
                     'suggestion': 'Consider using generic terms like "a client", "the company", or "the organization"'
                 })
+        
+        # Cache a private copy so callers can't mutate cached results
+        self._detection_cache[text] = [dict(detection) for detection in detections]
+        if len(self._detection_cache) > self.max_detection_cache_size:
+            self._detection_cache.popitem(last=False)
+        
         return detections
     
     def get_stats(self) -> Dict[str, any]:
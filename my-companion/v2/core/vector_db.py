@@ -1,13 +1,35 @@
 """
 Simple Vector Database using FAISS - Lightweight RAG implementation
 """
-import json
 import os
+import threading
 import numpy as np
 import faiss
+import orjson
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any, Optional
-import pickle
+
+# Embedding models load on a background thread so startup isn't blocked
+_model_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-model")
+_model_futures: Dict[str, Future] = {}
+_model_futures_lock = threading.Lock()
+
+
+def _get_embedding_model_future(model_name: str) -> Future:
+    """Return the (possibly still running) load of model_name, starting it if needed"""
+    with _model_futures_lock:
+        future = _model_futures.get(model_name)
+        if future is None or (future.done() and future.exception() is not None):
+            future = _model_loader.submit(SentenceTransformer, model_name)
+            _model_futures[model_name] = future
+        return future
+
+
+def preload_embedding_model() -> None:
+    """Start loading the default embedding model in the background (no-op once started)"""
+    _get_embedding_model_future(os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2"))
 
 
 class VectorDB:
@@ -18,18 +40,46 @@ class VectorDB:
     def __init__(self, embedding_model=None, index_path=None):
         # Use environment variables with fallbacks
         self.embedding_model_name = embedding_model or os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
+        # Loads in the background; only the first encode waits for it
+        _get_embedding_model_future(self.embedding_model_name)
+        self._embedding_model: Optional[SentenceTransformer] = None
         self.embedding_dim = 384  # Dimension for all-MiniLM-L6-v2
+        
+        # Recent query embeddings (LRU ordered), so repeated queries skip the transformer forward pass
+        self._query_cache: OrderedDict = OrderedDict()
+        self.max_query_cache_size = 256
         self.index_path = index_path or os.getenv("VECTOR_INDEX_PATH", "data/vector_index")
-        self.metadata_path = f"{index_path}_metadata.pkl"
+        self.metadata_path = f"{self.index_path}_metadata.json"
         
         # Initialize FAISS index
-        self.index = faiss.IndexFlatIP(self.embedding_dim)  # Inner product for cosine similarity
+        self.index = self._create_index()
         self.metadata = []  # Store metadata for each vector
+        self.texts = []  # Text of each vector, parallel to metadata
+        # Document text -> float32 embedding, reused across rebuilds (held in memory
+        # next to the index's 8-bit codes, so only the index itself is 4x smaller)
+        self._doc_embeddings: Dict[str, np.ndarray] = {}
         
         # Load existing index if available
         self.load_index()
     
+    @property
+    def embedding_model(self) -> SentenceTransformer:
+        """The embedding model, waiting for its background load on first use"""
+        if self._embedding_model is None:
+            self._embedding_model = _get_embedding_model_future(self.embedding_model_name).result()
+        return self._embedding_model
+    
+    def _create_index(self):
+        """
+        Create an empty HNSW graph index (inner product for cosine similarity)
+        Vectors are stored as 8-bit scalar-quantized codes, 4x smaller than float32
+        (on disk and in the index; _doc_embeddings still keeps a float32 copy)
+        """
+        index = faiss.IndexHNSWSQ(self.embedding_dim, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = 40
+        index.hnsw.efSearch = 16
+        return index
+    
     def add_documents(self, documents: List[Dict[str, Any]]):
         """
         Add documents to the vector database
@@ -40,21 +90,57 @@ class VectorDB:
         
         # Extract texts and embed them
         texts = [doc["text"] for doc in documents]
-        embeddings = self.embedding_model.encode(texts, convert_to_tensor=False)
-        
-        # Normalize embeddings for cosine similarity
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = self._embed_documents(texts)
         
-        # Add to FAISS index
-        self.index.add(embeddings.astype('float32'))
+        # Add to FAISS index (the quantizer learns value ranges from the first batch)
+        if not self.index.is_trained:
+            self.index.train(embeddings)
+        self.index.add(embeddings)
         
         # Store metadata
         for doc in documents:
-            self.metadata.append(doc.get("metadata", {}))
+            metadata = doc.get("metadata", {})
+            self.metadata.append(metadata)
+            self.texts.append(metadata.get("text", ""))
         
         # Save updated index
         self.save_index()
     
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed document texts, only running the model on texts not embedded before
+        Every live document's float32 embedding stays in _doc_embeddings, so this
+        cache costs as much memory as an unquantized index would
+        """
+        new_texts = [text for text in dict.fromkeys(texts) if text not in self._doc_embeddings]
+        if new_texts:
+            # Normalized inside encode for cosine similarity
+            new_embeddings = self.embedding_model.encode(
+                new_texts, batch_size=min(len(new_texts), 128), convert_to_numpy=True,
+                normalize_embeddings=True, show_progress_bar=False
+            ).astype('float32', copy=False)
+            self._doc_embeddings.update(zip(new_texts, new_embeddings))
+        
+        return np.stack([self._doc_embeddings[text] for text in texts])
+    
+    def _embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed queries as a normalized (n, dim) float32 matrix, encoding uncached ones in one batch"""
+        new_queries = [query for query in dict.fromkeys(queries) if query not in self._query_cache]
+        if new_queries:
+            new_embeddings = self.embedding_model.encode(
+                new_queries, batch_size=len(new_queries), convert_to_numpy=True,
+                normalize_embeddings=True, show_progress_bar=False
+            ).astype('float32', copy=False)
+            self._query_cache.update(zip(new_queries, new_embeddings))
+        
+        for query in queries:
+            self._query_cache.move_to_end(query)
+        embeddings = np.stack([self._query_cache[query] for query in queries])
+        while len(self._query_cache) > self.max_query_cache_size:
+            self._query_cache.popitem(last=False)
+        
+        return embeddings
+    
     def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """
         Search for similar documents
@@ -64,18 +150,36 @@ class VectorDB:
             return []
         
         # Embed query
-        query_embedding = self.embedding_model.encode([query], convert_to_tensor=False)
-        query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
+        query_embedding = self._embed_queries([query])
+        
+        # Search in FAISS
+        scores, indices = self.index.search(query_embedding, top_k)
+        
+        return self._prepare_results(scores[0], indices[0])
+    
+    def search_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries at once (at most one encode call, one FAISS search)
+        Returns: one result list per query, same format as search()
+        """
+        if not queries or self.index.ntotal == 0:
+            return [[] for _ in queries]
+        
+        # Embed all uncached queries together
+        query_embeddings = self._embed_queries(queries)
         
         # Search in FAISS
-        scores, indices = self.index.search(query_embedding.astype('float32'), top_k)
+        scores, indices = self.index.search(query_embeddings, top_k)
         
-        # Prepare results
+        return [self._prepare_results(row_scores, row_indices) for row_scores, row_indices in zip(scores, indices)]
+    
+    def _prepare_results(self, scores, indices) -> List[Dict[str, Any]]:
+        """Turn one row of FAISS scores/indices into result dicts"""
         results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < len(self.metadata):  # Valid index
+        for score, idx in zip(scores, indices):
+            if 0 <= idx < len(self.metadata):  # Valid index (FAISS pads missing hits with -1)
                 results.append({
-                    "text": self.metadata[idx].get("text", ""),
+                    "text": self.texts[idx],
                     "metadata": self.metadata[idx],
                     "score": float(score)
                 })
@@ -88,8 +192,9 @@ class VectorDB:
         Returns: number of documents added
         """
         # Clear existing index
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
+        self.index = self._create_index()
         self.metadata = []
+        self.texts = []
         
         documents = []
         
@@ -196,10 +301,14 @@ class VectorDB:
                     }
                 })
         
-        # Add all documents to vector DB
+        # Add all documents to vector DB (unchanged documents reuse their embeddings)
         if documents:
             self.add_documents(documents)
         
+        # Forget embeddings of documents that no longer exist
+        live_texts = {doc["text"] for doc in documents}
+        self._doc_embeddings = {text: emb for text, emb in self._doc_embeddings.items() if text in live_texts}
+        
         return len(documents)
     
     def save_index(self):
@@ -213,7 +322,7 @@ class VectorDB:
             
             # Save metadata
             with open(self.metadata_path, 'wb') as f:
-                pickle.dump(self.metadata, f)
+                f.write(orjson.dumps(self.metadata))
         except Exception as e:
             print(f"Error saving index: {e}")
     
@@ -227,12 +336,21 @@ class VectorDB:
             # Load metadata
             if os.path.exists(self.metadata_path):
                 with open(self.metadata_path, 'rb') as f:
-                    self.metadata = pickle.load(f)
+                    self.metadata = orjson.loads(f.read())
+            self.texts = [metadata.get("text", "") for metadata in self.metadata]
+            
+            # Vectors without matching metadata can't be returned; start empty so callers rebuild
+            if self.index.ntotal != len(self.metadata):
+                print("Vector index and metadata are out of sync, starting with an empty index")
+                self.index = self._create_index()
+                self.metadata = []
+                self.texts = []
         except Exception as e:
             print(f"Error loading index: {e}")
             # Reset to empty state on error
-            self.index = faiss.IndexFlatIP(self.embedding_dim)
+            self.index = self._create_index()
             self.metadata = []
+            self.texts = []
     
     def get_stats(self) -> Dict[str, Any]:
         """Get vector database statistics"""
@@ -240,5 +358,5 @@ class VectorDB:
             "total_documents": self.index.ntotal,
             "embedding_dimension": self.embedding_dim,
             "model": "all-MiniLM-L6-v2",
-            "index_type": "FAISS IndexFlatIP"
+            "index_type": f"FAISS {type(self.index).__name__}"
         }
\ No newline at end of file
@@ -3,7 +3,7 @@ My Companion v2 - Lightweight Agentic AI
 Minimal enhancement over v1: just adds basic agent planning and simple guardrails
 """
 import streamlit as st
-import json
+import orjson
 import os
 from datetime import datetime
 from openai import OpenAI
@@ -15,7 +15,12 @@ load_dotenv()
 # Import v2 core components
 from core.agent import Agent
 from core.guardrails import Guardrails
-from core.vector_db import VectorDB
+from core.vector_db import VectorDB, preload_embedding_model
+from utils.data_store import KNOWLEDGE_BASE_PATH, get_data_version
+
+# Start loading the embedding model now; VectorDB only waits for it on its first
+# encode, so the first page renders while the model loads
+preload_embedding_model()
 
 # Configure Streamlit (same as v1)
 st.set_page_config(
@@ -24,12 +29,14 @@ st.set_page_config(
     layout="wide"
 )
 
+# cache_resource (not cache_data): the forms edit this dict in place and expect
+# every page to see the same object
 @st.cache_resource
 def load_data():
     """Load knowledge base data (same as v1)"""
     try:
-        with open("data/knowledge_base.json", "r") as f:
-            return json.load(f)
+        with open(KNOWLEDGE_BASE_PATH, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         return {
             "basic_info": {},
@@ -38,6 +45,29 @@ def load_data():
             "other_activities": []
         }
 
+def _data_version_key(_data):
+    """Cache key for values derived from the data dict: changes on every save"""
+    return get_data_version()
+
+@st.cache_data(hash_funcs={dict: _data_version_key})
+def compute_data_stats(data):
+    """Section counts and formatted skill lists, recomputed only after the data is saved"""
+    skills = data.get('technical_skills', [])
+    skills_formatted = {}
+    if isinstance(skills, dict):
+        skills_formatted = {
+            category: ", ".join(skill_list) if isinstance(skill_list, list) else str(skill_list)
+            for category, skill_list in skills.items()
+        }
+    
+    return {
+        "projects": len(data.get('projects', [])),
+        "skills": len(skills),
+        "activities": len(data.get('other_activities', [])),
+        "has_profile": bool(data.get('user_profile')),
+        "skills_formatted": skills_formatted
+    }
+
 @st.cache_resource
 def get_llm_client():
     """Initialize LLM client with environment variables"""
@@ -46,12 +76,19 @@ def get_llm_client():
         api_key=os.getenv("LLM_API_KEY", "lm-studio")
     )
 
+def _index_is_stale(vector_db):
+    """True if the knowledge base was saved after the vector index was last written"""
+    try:
+        return os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns > os.stat(f"{vector_db.index_path}.faiss").st_mtime_ns
+    except FileNotFoundError:
+        return False
+
 @st.cache_resource
 def init_vector_db():
     """Initialize the lightweight vector database"""
     vector_db = VectorDB()
-    # Auto-rebuild if no vectors exist
-    if vector_db.get_stats()["total_documents"] == 0:
+    # Auto-rebuild if no vectors exist, or if the last save's debounced sync never ran
+    if vector_db.get_stats()["total_documents"] == 0 or _index_is_stale(vector_db):
         data = load_data()
         vector_db.rebuild_from_data(data)
     return vector_db
@@ -61,7 +98,7 @@ def init_agent():
     """Initialize the lightweight agent with RAG"""
     llm_client = get_llm_client()
     vector_db = init_vector_db()
-    agent = Agent(llm_client, load_data, vector_db)
+    agent = Agent(llm_client, load_data, vector_db, data_version=get_data_version)
     return agent
 
 @st.cache_resource  
@@ -77,6 +114,7 @@ def main():
     guardrails = init_guardrails()
     vector_db = init_vector_db()
     data = load_data()
+    data_stats = compute_data_stats(data)
     
     # Header (similar to v1)
     st.title("🤖 My Companion (v2)")
@@ -103,11 +141,10 @@ def main():
         st.write(f"**Status:** {agent_stats['status']}")
         
         # Data stats (V1 schema)
-        st.write(f"**Projects:** {len(data.get('projects', []))}")
-        skills_count = len(data.get('technical_skills', {})) if isinstance(data.get('technical_skills'), dict) else len(data.get('technical_skills', []))
-        st.write(f"**Skills:** {skills_count}")
-        st.write(f"**Activities:** {len(data.get('other_activities', []))}")
-        if data.get('user_profile'):
+        st.write(f"**Projects:** {data_stats['projects']}")
+        st.write(f"**Skills:** {data_stats['skills']}")
+        st.write(f"**Activities:** {data_stats['activities']}")
+        if data_stats['has_profile']:
             st.write(f"**Profile:** ✅ Loaded")
         
         # Vector DB stats
@@ -174,7 +211,7 @@ def main():
         with tab1:
             # Import and use profile overview functionality
             from app.profile_overview import show
-            show(data)
+            show(data, data_stats["skills_formatted"])
         
         with tab2:
             # Import and use profile search functionality
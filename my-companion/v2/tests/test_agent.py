@@ -0,0 +1,104 @@
+"""
+Tests for Agent.ask_multi and splitting its combined answer into sections
+"""
+from types import SimpleNamespace
+
+from core.agent import Agent, _split_sections
+
+
+class FakeLLMClient:
+    """Stands in for the OpenAI client: records prompts, returns a canned answer or raises"""
+    
+    def __init__(self, answer=None, error=None):
+        self.prompts = []
+        self.answer = answer
+        self.error = error
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    def _create(self, messages, **kwargs):
+        self.prompts.append(messages[0]["content"])
+        if self.error:
+            raise self.error
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.answer))])
+
+
+class FakeVectorDB:
+    """Returns one result per query and records how it was called"""
+    
+    def __init__(self):
+        self.batch_calls = []
+        self.search_calls = []
+    
+    def search(self, query, top_k=5):
+        self.search_calls.append(query)
+        return [{"text": f"match for {query}", "metadata": {}, "score": 0.9}]
+    
+    def search_batch(self, queries, top_k=5):
+        self.batch_calls.append(list(queries))
+        return [[{"text": f"match for {query}", "metadata": {}, "score": 0.9}] for query in queries]
+
+
+_QUESTIONS = ["What skills should I improve?", "Which project shows my best work?"]
+
+
+def test_split_plain_headings():
+    response = "### Section 1\nFirst answer\n\n### Section 2:\nSecond answer"
+    assert _split_sections(response) == {1: "First answer", 2: "Second answer"}
+
+
+def test_split_titled_headings():
+    response = "### Section 1: Profile Analysis\nStrong backend skills\n### Section 2 - Career Growth\nLead a project"
+    assert _split_sections(response) == {1: "Strong backend skills", 2: "Lead a project"}
+
+
+def test_split_bold_headings():
+    response = "**Section 1**\nFirst answer\n\n**Section 2: Learning**\nSecond answer"
+    assert _split_sections(response) == {1: "First answer", 2: "Second answer"}
+
+
+def test_split_missing_section():
+    response = "Intro text\n### Section 1\nFirst answer\n### Section 3\nThird answer"
+    sections = _split_sections(response)
+    assert sections == {1: "First answer", 3: "Third answer"}
+    assert 2 not in sections
+
+
+def test_split_ignores_unmarked_section_text():
+    response = "### Section 1\nA\nSection 2 of the plan covers X\nmore\n### Section 2\nB"
+    assert _split_sections(response) == {1: "A\nSection 2 of the plan covers X\nmore", 2: "B"}
+
+
+def test_ask_multi_one_llm_call_and_batched_search():
+    llm = FakeLLMClient(answer="### Section 1: Skills\nLearn Rust\n### Section 2: Projects\nThe search app")
+    vector_db = FakeVectorDB()
+    agent = Agent(llm, dict, vector_db)
+    
+    results = agent.ask_multi(_QUESTIONS)
+    
+    assert [result["response"] for result in results] == ["Learn Rust", "The search app"]
+    assert len(llm.prompts) == 1
+    assert vector_db.batch_calls == [_QUESTIONS] and vector_db.search_calls == []
+    # Each question's own context reaches the prompt
+    assert all(f"match for {question}" in llm.prompts[0] for question in _QUESTIONS)
+
+
+def test_ask_multi_llm_failure_is_not_retried_per_question():
+    llm = FakeLLMClient(error=ConnectionError("LLM server down"))
+    agent = Agent(llm, dict, FakeVectorDB())
+    
+    results = agent.ask_multi(_QUESTIONS)
+    
+    assert len(llm.prompts) == 1
+    assert [result["success"] for result in results] == [False, False]
+    assert all("LLM server down" in result["error"] for result in results)
+    assert len(agent.conversation_history) == 2
+
+
+def test_ask_multi_missing_section_falls_back_to_ask_question():
+    llm = FakeLLMClient(answer="### Section 1\nLearn Rust")
+    agent = Agent(llm, dict, FakeVectorDB())
+    
+    results = agent.ask_multi(_QUESTIONS)
+    
+    assert results[0]["response"] == "Learn Rust"
+    assert results[1]["success"] and len(llm.prompts) == 2
@@ -3,15 +3,102 @@ Data Store utilities for V2 - Compatible with V1 schema
 Works with existing V1 data structure without modifications
 Auto-syncs with vector database for search and AI features
 """
-import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
 
+import orjson
+
+# Imported once up front (main.py loads core at startup anyway); None without the vector stack
+try:
+    from core.vector_db import VectorDB
+except ImportError:
+    VectorDB = None
+
+KNOWLEDGE_BASE_PATH = "data/knowledge_base.json"
+
+# Bumped on every save_data call, even a failed one (the caller has already edited its dict)
+_data_version = 0
+
+def get_data_version() -> int:
+    """Version of the profile data, for keying caches of values derived from it"""
+    return _data_version
+
+# Last loaded/saved knowledge base, reused while the file's mtime is unchanged
+# (a save caches its written bytes, parsed only when load_data next needs them)
+_data_cache: Dict[str, Any] = {"mtime": None, "data": None, "payload": None}
+_data_cache_lock = threading.Lock()
+
+# Vector DB used for auto-sync, created on the first synced save
+_vector_db = None
+
+def _get_vector_db():
+    """Return the VectorDB shared by every auto-sync, creating it on first use"""
+    global _vector_db
+    if _vector_db is None:
+        if VectorDB is None:
+            raise RuntimeError("vector database dependencies are not installed")
+        _vector_db = VectorDB()
+    return _vector_db
+
+# Saves within this many seconds of each other share one vector DB rebuild
+SYNC_DEBOUNCE_SECONDS = float(os.getenv("VECTOR_SYNC_DEBOUNCE_S", "2"))
+_sync_timer: Optional[threading.Timer] = None
+_sync_lock = threading.Lock()
+
+# Rebuilds run one at a time on this worker, off the Streamlit script thread
+_sync_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-sync")
+
+def _sync_vector_db():
+    """Rebuild the vector database from the most recently saved data"""
+    try:
+        _get_vector_db().rebuild_from_data(load_data())
+        print("✅ Vector database synchronized with profile changes")
+    except Exception as sync_error:
+        print(f"⚠️ Could not sync with vector database: {sync_error}")
+        print("💡 Manual rebuild available in sidebar if search seems outdated")
+
+def _submit_sync():
+    """Debounce timer callback: hand the rebuild to the sync worker"""
+    global _sync_timer
+    with _sync_lock:
+        # A newer save may have taken over from this timer
+        if _sync_timer is not threading.current_thread():
+            return
+        _sync_timer = None
+        _sync_pool.submit(_sync_vector_db)
+
+def _schedule_sync():
+    """(Re)start the debounce timer so only the last of several quick saves rebuilds"""
+    global _sync_timer
+    with _sync_lock:
+        if _sync_timer is not None:
+            _sync_timer.cancel()
+            _sync_timer = None
+        if SYNC_DEBOUNCE_SECONDS <= 0:
+            _sync_pool.submit(_sync_vector_db)
+            return
+        _sync_timer = threading.Timer(SYNC_DEBOUNCE_SECONDS, _submit_sync)
+        _sync_timer.daemon = True
+        _sync_timer.start()
+
 def load_data() -> Dict[str, Any]:
     """Load knowledge base data using existing V1 schema"""
     try:
-        with open("data/knowledge_base.json", "r") as f:
-            return json.load(f)
+        mtime = os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns
+        with _data_cache_lock:
+            if _data_cache["mtime"] == mtime:
+                if _data_cache["data"] is None and _data_cache["payload"] is not None:
+                    _data_cache.update(data=orjson.loads(_data_cache["payload"]), payload=None)
+                if _data_cache["data"] is not None:
+                    return _data_cache["data"]
+        
+        with open(KNOWLEDGE_BASE_PATH, "rb") as f:
+            data = orjson.loads(f.read())
+        with _data_cache_lock:
+            _data_cache.update(mtime=mtime, data=data, payload=None)
+        return data
     except FileNotFoundError:
         return {
             "user_profile": {
@@ -34,47 +121,30 @@ def save_data(data: Dict[str, Any], auto_sync: bool = True) -> bool:
         data: Profile data to save
         auto_sync: Whether to automatically rebuild vector database (default: True)
     """
+    global _data_version
+    _data_version += 1
+    
     try:
         # Ensure data directory exists
         os.makedirs("data", exist_ok=True)
         
         # Save to JSON file
-        with open("data/knowledge_base.json", "w") as f:
-            json.dump(data, f, indent=2)
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        with open(KNOWLEDGE_BASE_PATH, "wb") as f:
+            f.write(payload)
+        
+        # Cache the written bytes, not the caller's dict: the forms keep editing
+        # that one in place while the sync worker reads the cached copy
+        with _data_cache_lock:
+            _data_cache.update(mtime=os.stat(KNOWLEDGE_BASE_PATH).st_mtime_ns, data=None, payload=payload)
         
         # Auto-sync with vector database if enabled
         # Can be disabled via environment variable for performance
         auto_sync_enabled = os.getenv("AUTO_SYNC_VECTOR_DB", "true").lower() == "true"
         
         if auto_sync and auto_sync_enabled:
-            try:
-                # Import here to avoid circular imports
-                from core.agent import Agent
-                from core.vector_db import VectorDB
-                from openai import OpenAI
-                from dotenv import load_dotenv
-                
-                load_dotenv()
-                
-                # Initialize components for vector DB rebuild
-                llm_client = OpenAI(
-                    base_url=os.getenv("LLM_BASE_URL", "http://localhost:1234/v1"),
-                    api_key=os.getenv("LLM_API_KEY", "lm-studio")
-                )
-                vector_db = VectorDB()
-                agent = Agent(llm_client, load_data, vector_db)
-                
-                # Rebuild vector database with new data
-                rebuild_result = agent.rebuild_knowledge_base()
-                if rebuild_result.get("success", False):
-                    print("✅ Vector database synchronized with profile changes")
-                else:
-                    print(f"⚠️ Vector DB sync failed: {rebuild_result.get('error', 'Unknown error')}")
-                
-            except Exception as sync_error:
-                print(f"⚠️ Could not sync with vector database: {sync_error}")
-                print("💡 Manual rebuild available in sidebar if search seems outdated")
-                # Don't fail the save operation if vector sync fails
+            # Rebuilt in the background; sync errors never fail the save itself
+            _schedule_sync()
         
         return True
     except Exception as e:
@@ -2,9 +2,29 @@
 Privacy Helper Utilities
 Provides guidance and validation for maintaining client confidentiality
 """
+from types import MappingProxyType
 import streamlit as st
 from core.guardrails import Guardrails
 
+# Privacy-safe placeholder text per form field type (read-only)
+_PLACEHOLDERS = MappingProxyType({
+    'project_description': 'Led architecture for a financial services platform using microservices and cloud technologies...',
+    'company_description': 'A leading technology company in the healthcare domain...',
+    'client_work': 'Collaborated with stakeholders at a Fortune 500 retail organization...',
+    'project_name': 'E-commerce Platform Modernization',
+    'responsibilities': 'Designed and implemented solutions for business requirements, led team coordination...'
+})
+
+# Shared across calls so validation reuses one set of compiled patterns and its detection cache
+_guardrails = None
+
+def _get_guardrails() -> Guardrails:
+    """Return the shared Guardrails instance, creating it on first use"""
+    global _guardrails
+    if _guardrails is None:
+        _guardrails = Guardrails()
+    return _guardrails
+
 def show_privacy_guidelines():
     """Show privacy guidelines for professional information"""
     with st.expander("🔒 Privacy Guidelines", expanded=False):
@@ -34,7 +54,7 @@ def validate_client_privacy(text: str, field_name: str = "input") -> bool:
     Validate text for client privacy and show warnings if needed
     Returns True if validation passes, False if concerns detected
     """
-    guardrails = Guardrails()
+    guardrails = _get_guardrails()
     
     # Check for client information
     detections = guardrails.detect_client_info(text)
@@ -53,15 +73,7 @@ def validate_client_privacy(text: str, field_name: str = "input") -> bool:
 
 def get_privacy_safe_placeholder(field_type: str) -> str:
     """Get privacy-safe placeholder text for different field types"""
-    placeholders = {
-        'project_description': 'Led architecture for a financial services platform using microservices and cloud technologies...',
-        'company_description': 'A leading technology company in the healthcare domain...',
-        'client_work': 'Collaborated with stakeholders at a Fortune 500 retail organization...',
-        'project_name': 'E-commerce Platform Modernization',
-        'responsibilities': 'Designed and implemented solutions for business requirements, led team coordination...'
-    }
-    
-    return placeholders.get(field_type, 'Enter your professional experience using generic terms...')
+    return _PLACEHOLDERS.get(field_type, 'Enter your professional experience using generic terms...')
 
 def suggest_generic_alternatives():
     """Show common generic alternatives for client descriptions"""